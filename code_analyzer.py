@@ -1,12 +1,100 @@
 # code_analyzer.py
 import ast
+import bisect
+import hashlib
+import mmap
 import os
+import pickle
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
 from pathlib import Path
 from typing import Dict, List, Any
 
+# Below this many files the process-spawn overhead outweighs the speedup
+_PARALLEL_THRESHOLD = 8
+
+# Bump to invalidate cached analyses when extraction logic changes
+_ANALYZER_VERSION = 5
+
+# Directory names that never contain source worth documenting
+_SKIP_DIRS = {'.git', 'node_modules', '__pycache__', 'venv', '.venv'}
+
+# Prefer RE2 for the extractors when available: linear-time matching
+# with no backtracking blowups on large minified JS/TS blobs. The
+# patterns below use no constructs RE2 lacks, so the stdlib engine is a
+# drop-in fallback.
+try:
+    import re2 as _regex
+except ImportError:
+    _regex = re
+
+# Precompiled patterns -- compiling once at import time avoids the re-module
+# cache lookup on every file parsed.
+_PY_FUNC_RE = _regex.compile(r'def\s+(\w+)\s*\(([^)]*)\)')
+_JS_FUNC_RE = _regex.compile(
+    r'function\s+(?P<func_name>\w+)\s*\((?P<func_args>[^)]*)\)'
+    r'|(?:const|let)\s+(?P<arrow_name>\w+)\s*=\s*\((?P<arrow_args>[^)]*)\)\s*=>'
+    r'|(?P<method_name>\w+)\s*\((?P<method_args>[^)]*)\)\s*\{'
+)
+_JAVA_FUNC_RE = _regex.compile(r'(public|private|protected)\s+\w+\s+(\w+)\s*\(([^)]*)\)')
+_CPP_FUNC_RE = _regex.compile(r'\w+\s+(\w+)\s*\(([^)]*)\)')
+_GENERIC_FUNC_RE = _regex.compile(r'def\s+(\w+)|function\s+(\w+)|fn\s+(\w+)|fun\s+(\w+)')
+_CLASS_RE = _regex.compile(r'class\s+(\w+)')
+# Import patterns capture the statement with whitespace already excluded
+# so findall returns usable strings with no per-match strip
+_PY_IMPORT_RE = _regex.compile(
+    r'^[ \t]*((?:import|from)\s+\S+(?:\s+import\s+[^\n]*\S)?)', _regex.MULTILINE)
+_JS_IMPORT_RE = _regex.compile(
+    r'^[ \t]*(import\s+.*?from\s+[\'"][^\'"]+[\'"])', _regex.MULTILINE)
+_JAVA_IMPORT_RE = _regex.compile(
+    r'^[ \t]*(import\s+[^;\n]+?)\s*;', _regex.MULTILINE)
+
+
+def _iter_source_files(root: str, extensions: tuple):
+    """Yield source file paths under root using os.scandir
+
+    DirEntry type checks come straight from the directory listing, so
+    rejected entries cost no stat call and no Path construction.
+    """
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in _SKIP_DIRS:
+                        stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False) and entry.name.endswith(extensions):
+                    yield entry.path
+
+
+def _docstring_of(node) -> str:
+    """Read a def's docstring directly without re-walking its body"""
+    if (node.body and isinstance(node.body[0], ast.Expr)
+            and isinstance(node.body[0].value, ast.Constant)
+            and isinstance(node.body[0].value.value, str)):
+        return node.body[0].value.value
+    return ''
+
+
+def _line_index(content: str) -> List[int]:
+    """Build a sorted list of newline offsets for O(log N) line lookups"""
+    offsets = []
+    pos = content.find('\n')
+    while pos != -1:
+        offsets.append(pos)
+        pos = content.find('\n', pos + 1)
+    return offsets
+
+
 class CodeAnalyzer:
-    def __init__(self):
+    def __init__(self, cache_dir: str = 'analysis_cache'):
+        self.cache_dir = Path(cache_dir)
         self.supported_extensions = {
             '.py': 'python',
             '.js': 'javascript', 
@@ -19,6 +107,9 @@ class CodeAnalyzer:
             '.php': 'php',
             '.rb': 'ruby'
         }
+        # endswith on a tuple is a single C-level check per entry in the
+        # walker's hot filter
+        self._ext_tuple = tuple(self.supported_extensions)
     
     def analyze_directory(self, root_path: str) -> Dict[str, Any]:
         """Analyze entire codebase structure"""
@@ -32,41 +123,137 @@ class CodeAnalyzer:
             'structure': {}
         }
         
-        for file_path in Path(root_path).rglob('*'):
-            if file_path.is_file() and file_path.suffix in self.supported_extensions:
-                file_analysis = self.analyze_file(file_path)
-                if file_analysis:
-                    analysis['files'].append(file_analysis)
-                    analysis['total_files'] += 1
-                    analysis['total_functions'] += len(file_analysis['functions'])
-                    analysis['total_classes'] += len(file_analysis['classes'])
-                    analysis['languages_used'].add(self.supported_extensions[file_path.suffix])
-        
+        paths = [Path(p) for p in _iter_source_files(str(root_path), self._ext_tuple)]
+
+        # Files are independent, so fan the CPU-bound AST/regex work out
+        # across cores; small trees stay on one core, with reads
+        # prefetched on threads so disk latency overlaps parsing
+        if len(paths) < _PARALLEL_THRESHOLD:
+            results = []
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                futures = [(p, executor.submit(p.read_bytes)) for p in paths]
+                for file_path, future in futures:
+                    try:
+                        raw = future.result()
+                    except Exception as e:
+                        print(f"⚠️  Could not read {file_path}: {e}")
+                        continue
+                    results.append(self._analyze_file_from_bytes(file_path, raw))
+        else:
+            with ProcessPoolExecutor() as executor:
+                results = list(executor.map(_analyze_file_worker, paths,
+                                            repeat(str(self.cache_dir)), chunksize=16))
+
+        cache_hits = 0
+        for file_analysis in results:
+            if file_analysis:
+                if file_analysis.pop('cache_hit', False):
+                    cache_hits += 1
+                analysis['files'].append(file_analysis)
+                analysis['total_files'] += 1
+                analysis['total_functions'] += len(file_analysis['functions'])
+                analysis['total_classes'] += len(file_analysis['classes'])
+                analysis['languages_used'].add(file_analysis['language'])
+
+        print(f"💾 Analysis cache: {cache_hits} hits, {analysis['total_files'] - cache_hits} misses")
+
         analysis['languages_used'] = list(analysis['languages_used'])
         return analysis
     
     def analyze_file(self, file_path: Path) -> Dict[str, Any]:
         """Analyze individual file"""
+        # Memory-map the file so the hash reads straight from the page
+        # cache, and only decode to str on a cache miss
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            fd = os.open(file_path, os.O_RDONLY)
         except Exception as e:
             print(f"⚠️  Could not read {file_path}: {e}")
             return None
-        
+
+        mm = None
+        try:
+            try:
+                mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                mm = None  # zero-length files cannot be mapped
+            return self._analyze_file_from_bytes(file_path, mm if mm is not None else b'')
+        except Exception as e:
+            print(f"⚠️  Could not read {file_path}: {e}")
+            return None
+        finally:
+            if mm is not None:
+                mm.close()
+            os.close(fd)
+
+    def _analyze_file_from_bytes(self, file_path: Path, data) -> Dict[str, Any]:
+        """Analyze a file given its raw bytes (or a readable buffer)"""
+        # Cache key covers file bytes + suffix + analyzer version: the
+        # suffix selects which extractor runs, and the version constant
+        # invalidates stale entries when logic changes
+        hasher = hashlib.sha256(f"{_ANALYZER_VERSION}\0{file_path.suffix}\0".encode())
+        hasher.update(data)
+        cache_path = self.cache_dir / (hasher.hexdigest() + '.pkl')
+
+        cached = self._load_cached_analysis(cache_path, file_path)
+        if cached is not None:
+            return cached
+
+        content = (data if isinstance(data, bytes) else data[:]).decode('utf-8', errors='ignore')
+
+        suffix = file_path.suffix
+        if suffix == '.py':
+            try:
+                # Parse once and collect everything in a single walk
+                functions, classes, imports = self._extract_python_all(content)
+            except Exception:
+                # Fallback to regex for problematic files
+                functions = self._extract_python_functions_regex(content)
+                classes = self.extract_classes(content, suffix)
+                imports = self.extract_imports(content, suffix)
+        else:
+            functions = self.extract_functions(content, suffix)
+            classes = self.extract_classes(content, suffix)
+            imports = self.extract_imports(content, suffix)
+
         file_analysis = {
             'path': str(file_path.relative_to(file_path.parent.parent)),
             'name': file_path.name,
             'extension': file_path.suffix,
             'language': self.supported_extensions.get(file_path.suffix, 'unknown'),
-            'content': content,
-            'functions': self.extract_functions(content, file_path.suffix),
-            'classes': self.extract_classes(content, file_path.suffix),
-            'imports': self.extract_imports(content, file_path.suffix),
-            'line_count': len(content.splitlines())
+            'functions': functions,
+            'classes': classes,
+            'imports': imports,
+            'line_count': content.count('\n') + (1 if content and not content.endswith('\n') else 0)
         }
-        
+
+        self._store_cached_analysis(cache_path, file_analysis)
+        file_analysis['cache_hit'] = False
         return file_analysis
+
+    def _load_cached_analysis(self, cache_path: Path, file_path: Path) -> Dict[str, Any]:
+        """Load a cached analysis dict, refreshing its path-derived fields"""
+        if not cache_path.exists():
+            return None
+        try:
+            with open(cache_path, 'rb') as f:
+                file_analysis = pickle.load(f)
+        except Exception:
+            return None
+
+        # Identical content can live at different paths
+        file_analysis['path'] = str(file_path.relative_to(file_path.parent.parent))
+        file_analysis['name'] = file_path.name
+        file_analysis['cache_hit'] = True
+        return file_analysis
+
+    def _store_cached_analysis(self, cache_path: Path, file_analysis: Dict[str, Any]):
+        """Persist an analysis dict; cache failures are non-fatal"""
+        try:
+            self.cache_dir.mkdir(exist_ok=True)
+            with open(cache_path, 'wb') as f:
+                pickle.dump(file_analysis, f)
+        except Exception as e:
+            print(f"⚠️  Could not cache analysis for {file_analysis['name']}: {e}")
     
     def extract_functions(self, content: str, extension: str) -> List[Dict]:
         """Extract function definitions based on language"""
@@ -81,36 +268,63 @@ class CodeAnalyzer:
         else:
             return self._extract_generic_functions(content, extension)
     
-    def _extract_python_functions(self, content: str) -> List[Dict]:
-        """Extract Python functions using AST"""
-        functions = []
-        try:
-            tree = ast.parse(content)
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
+    def _extract_python_all(self, content: str) -> tuple:
+        """Extract functions, classes, and imports in a single AST walk
+
+        Only module and class bodies are descended into -- the defs worth
+        documenting live there, and a full ast.walk would visit every
+        expression node in the file for nothing.
+        """
+        tree = ast.parse(content)
+        functions, classes, imports = [], [], []
+
+        # FIFO so classes are processed in source order
+        queue = deque([tree])
+        while queue:
+            node = queue.popleft()
+            for child in node.body:
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
                     functions.append({
-                        'name': node.name,
-                        'line': node.lineno,
-                        'args': [arg.arg for arg in node.args.args],
-                        'docstring': ast.get_docstring(node) or '',
+                        'name': child.name,
+                        'line': child.lineno,
+                        'args': [arg.arg for arg in child.args.args],
+                        'docstring': _docstring_of(child),
                         'type': 'function'
                     })
+                elif isinstance(child, ast.ClassDef):
+                    classes.append({
+                        'name': child.name,
+                        'line': child.lineno
+                    })
+                    queue.append(child)
+                elif isinstance(child, ast.Import):
+                    imports.append('import ' + ', '.join(alias.name for alias in child.names))
+                elif isinstance(child, ast.ImportFrom):
+                    names = ', '.join(alias.name for alias in child.names)
+                    module = '.' * child.level + (child.module or '')
+                    imports.append(f"from {module} import {names}")
+
+        return functions, classes, imports
+
+    def _extract_python_functions(self, content: str) -> List[Dict]:
+        """Extract Python functions using AST"""
+        try:
+            functions, _, _ = self._extract_python_all(content)
         except Exception as e:
             # Fallback to regex for problematic files
             functions = self._extract_python_functions_regex(content)
-        
+
         return functions
     
     def _extract_python_functions_regex(self, content: str) -> List[Dict]:
         """Fallback Python function extraction using regex"""
         functions = []
-        pattern = r'def\s+(\w+)\s*\(([^)]*)\)'
-        matches = re.finditer(pattern, content)
-        
-        for match in matches:
+        nl = _line_index(content)
+
+        for match in _PY_FUNC_RE.finditer(content):
             functions.append({
                 'name': match.group(1),
-                'line': content[:match.start()].count('\n') + 1,
+                'line': bisect.bisect_right(nl, match.start()) + 1,
                 'args': [arg.strip() for arg in match.group(2).split(',') if arg.strip()],
                 'docstring': '',
                 'type': 'function'
@@ -121,36 +335,31 @@ class CodeAnalyzer:
     def _extract_javascript_functions(self, content: str) -> List[Dict]:
         """Extract JavaScript/TypeScript functions"""
         functions = []
-        patterns = [
-            r'function\s+(\w+)\s*\(([^)]*)\)',
-            r'const\s+(\w+)\s*=\s*\(([^)]*)\)\s*=>',
-            r'let\s+(\w+)\s*=\s*\(([^)]*)\)\s*=>',
-            r'(\w+)\s*\(([^)]*)\)\s*\{'
-        ]
-        
-        for pattern in patterns:
-            matches = re.finditer(pattern, content)
-            for match in matches:
-                functions.append({
-                    'name': match.group(1),
-                    'line': content[:match.start()].count('\n') + 1,
-                    'args': [arg.strip() for arg in match.group(2).split(',') if arg.strip()],
-                    'docstring': '',
-                    'type': 'function'
-                })
-        
+        nl = _line_index(content)
+        # Single alternation so the scanner passes over the source once
+        # instead of once per pattern
+        for match in _JS_FUNC_RE.finditer(content):
+            name = match.group('func_name') or match.group('arrow_name') or match.group('method_name')
+            args = match.group('func_args') or match.group('arrow_args') or match.group('method_args') or ''
+            functions.append({
+                'name': name,
+                'line': bisect.bisect_right(nl, match.start()) + 1,
+                'args': [arg.strip() for arg in args.split(',') if arg.strip()],
+                'docstring': '',
+                'type': 'function'
+            })
+
         return functions
     
     def _extract_java_functions(self, content: str) -> List[Dict]:
         """Extract Java methods"""
         functions = []
-        pattern = r'(public|private|protected)\s+\w+\s+(\w+)\s*\(([^)]*)\)'
-        matches = re.finditer(pattern, content)
-        
-        for match in matches:
+        nl = _line_index(content)
+
+        for match in _JAVA_FUNC_RE.finditer(content):
             functions.append({
                 'name': match.group(2),
-                'line': content[:match.start()].count('\n') + 1,
+                'line': bisect.bisect_right(nl, match.start()) + 1,
                 'args': [arg.strip() for arg in match.group(3).split(',') if arg.strip()],
                 'docstring': '',
                 'type': 'method'
@@ -161,13 +370,12 @@ class CodeAnalyzer:
     def _extract_cpp_functions(self, content: str) -> List[Dict]:
         """Extract C++ functions"""
         functions = []
-        pattern = r'\w+\s+(\w+)\s*\(([^)]*)\)'
-        matches = re.finditer(pattern, content)
-        
-        for match in matches:
+        nl = _line_index(content)
+
+        for match in _CPP_FUNC_RE.finditer(content):
             functions.append({
                 'name': match.group(1),
-                'line': content[:match.start()].count('\n') + 1,
+                'line': bisect.bisect_right(nl, match.start()) + 1,
                 'args': [arg.strip() for arg in match.group(2).split(',') if arg.strip()],
                 'docstring': '',
                 'type': 'function'
@@ -178,15 +386,14 @@ class CodeAnalyzer:
     def _extract_generic_functions(self, content: str, extension: str) -> List[Dict]:
         """Generic function extraction for other languages"""
         functions = []
+        nl = _line_index(content)
+
         # Simple pattern that works for many languages
-        pattern = r'def\s+(\w+)|function\s+(\w+)|fn\s+(\w+)|fun\s+(\w+)'
-        matches = re.finditer(pattern, content)
-        
-        for match in matches:
+        for match in _GENERIC_FUNC_RE.finditer(content):
             name = next((group for group in match.groups() if group), 'unknown')
             functions.append({
                 'name': name,
-                'line': content[:match.start()].count('\n') + 1,
+                'line': bisect.bisect_right(nl, match.start()) + 1,
                 'args': [],
                 'docstring': '',
                 'type': 'function'
@@ -197,40 +404,39 @@ class CodeAnalyzer:
     def extract_classes(self, content: str, extension: str) -> List[Dict]:
         """Extract class definitions"""
         classes = []
-        
-        if extension == '.py':
-            pattern = r'class\s+(\w+)'
-        elif extension in ['.js', '.ts']:
-            pattern = r'class\s+(\w+)'
-        elif extension == '.java':
-            pattern = r'class\s+(\w+)'
-        else:
-            pattern = r'class\s+(\w+)'
-        
-        matches = re.finditer(pattern, content)
-        for match in matches:
+        nl = _line_index(content)
+
+        for match in _CLASS_RE.finditer(content):
             classes.append({
                 'name': match.group(1),
-                'line': content[:match.start()].count('\n') + 1
+                'line': bisect.bisect_right(nl, match.start()) + 1
             })
         
         return classes
     
     def extract_imports(self, content: str, extension: str) -> List[str]:
         """Extract import statements"""
-        imports = []
-        
         if extension == '.py':
-            pattern = r'^(import|from)\s+(\w+)'
+            pattern = _PY_IMPORT_RE
         elif extension in ['.js', '.ts']:
-            pattern = r'^import\s+.*from\s+[\'"]([^\'"]+)[\'"]'
+            pattern = _JS_IMPORT_RE
         elif extension == '.java':
-            pattern = r'^import\s+([^;]+);'
+            pattern = _JAVA_IMPORT_RE
         else:
-            return imports
-        
-        matches = re.finditer(pattern, content, re.MULTILINE)
-        for match in matches:
-            imports.append(match.group(0).strip())
-        
-        return imports
\ No newline at end of file
+            return []
+
+        # findall on a single pre-trimmed group returns plain strings
+        # with no Match objects or per-hit strip
+        return pattern.findall(content)
+
+
+# One analyzer per worker process, created lazily on first use
+_worker_analyzer = None
+
+
+def _analyze_file_worker(file_path: Path, cache_dir: str) -> Dict[str, Any]:
+    """Top-level wrapper so analyze_file is picklable for the process pool"""
+    global _worker_analyzer
+    if _worker_analyzer is None or str(_worker_analyzer.cache_dir) != cache_dir:
+        _worker_analyzer = CodeAnalyzer(cache_dir=cache_dir)
+    return _worker_analyzer.analyze_file(file_path)
\ No newline at end of file
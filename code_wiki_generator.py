@@ -33,9 +33,9 @@ class SimpleCodeWikiGenerator:
         # Generate documentation using LLM
         print("🤖 Generating documentation with LLM...")
         try:
-            documentation = self.llm_manager.generate_documentation(analysis)
-        
-            # Save wiki
+            documentation = self.llm_manager.stream_documentation(analysis)
+
+            # Save wiki, writing chunks as the model produces them
             self._save_wiki(documentation, analysis, output_file)
             
             print(f"✅ Wiki generated successfully: {output_file}")
@@ -43,20 +43,39 @@ class SimpleCodeWikiGenerator:
             # log it, return something safe, whatever you need
             print(f"❌ Failed to generate documentation: {e}")
             documentation = None  # or "" or some fallback
+        finally:
+            self.llm_manager.close()
     
-    def _save_wiki(self, documentation: str, analysis: dict, output_file: str):
-        """Save the generated wiki to a markdown file"""
-        
-        # Calculate totals
-        total_functions = sum(len(file.get('functions', [])) for file in analysis['files'])
-        total_classes = sum(len(file.get('classes', [])) for file in analysis['files'])
-        
-        wiki_content = f"""# Codebase Documentation
+    def generate_documentation_batch(self, analysis: dict, chunk_size: int = 10) -> list:
+        """Generate per-chunk documentation for large codebases
+
+        Splits the analyzed files into groups of chunk_size and sends one
+        prompt per group to the LLM concurrently, returning one
+        documentation section per group.
+        """
+        files = analysis['files']
+        contexts = [dict(analysis, files=files[start:start + chunk_size])
+                    for start in range(0, len(files), chunk_size)]
+        return self.llm_manager.generate_documentation_batch(contexts)
+
+    def _save_wiki(self, documentation, analysis: dict, output_file: str):
+        """Stream the generated wiki to a markdown file
+
+        documentation may be a complete string or an iterable of text
+        chunks; chunks are written as they arrive so disk I/O overlaps
+        with generation. Output goes to a temp file swapped in on
+        success, so a mid-stream failure never clobbers an existing wiki.
+        """
+        if isinstance(documentation, str):
+            documentation = (documentation,)
+
+        header = f"""# Codebase Documentation
 
 *Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*
 *Total files: {len(analysis['files'])}*
 
-{documentation}
+"""
+        footer = f"""
 
 ## File Structure
 
@@ -66,9 +85,21 @@ class SimpleCodeWikiGenerator:
 
 {self._generate_detailed_analysis(analysis)}
 """
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(wiki_content)
+
+        tmp_file = output_file + '.tmp'
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(header)
+                for chunk in documentation:
+                    f.write(chunk)
+                f.write(footer)
+            os.replace(tmp_file, output_file)
+        except Exception:
+            try:
+                os.unlink(tmp_file)
+            except OSError:
+                pass
+            raise
     
     def _generate_file_tree(self, analysis: dict) -> str:
         """Generate a file tree structure"""
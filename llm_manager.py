@@ -1,42 +1,199 @@
 # llm_manager.py
+import asyncio
+import hashlib
+import os
 import requests
-import json
-from typing import Dict, Any
+from pathlib import Path
+from typing import Dict, Any, List
+
+# httpx backs the concurrent batch API; the single-shot path works
+# without it
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Prefer orjson for the large prompt/response payloads; stdlib json is a
+# drop-in fallback when it is not installed
+try:
+    import orjson
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+    _json_loads = json.loads
+
+# Hard cap on the code-summary portion of the prompt so the model never
+# pays to process context it cannot fit
+_MAX_PROMPT_CHARS = 16000
+
+
+def _parse_ndjson(lines):
+    """Yield response text from a stream of Ollama NDJSON lines"""
+    for line in lines:
+        if not line:
+            continue
+        chunk = _json_loads(line)
+        if chunk.get("response"):
+            yield chunk["response"]
+        if chunk.get("done"):
+            break
+
 
 class LLMManager:
-    def __init__(self, model_name: str = "", base_url: str = "http://localhost:11435"):
+    # Ollama generation options; num_predict is the response token cap
+    DEFAULT_OPTIONS = {
+        "temperature": 0.1,
+        "top_p": 0.9,
+        "num_predict": 4000
+    }
+
+    def __init__(self, model_name: str = "", base_url: str = "http://localhost:11435",
+                 cache_dir: str = 'llm_cache', timeout: float = 600, options: Dict = None):
         self.base_url = base_url
         self.model_name = model_name
-    
+        self.cache_dir = Path(cache_dir)
+        self.timeout = timeout
+        self.options = options if options is not None else dict(self.DEFAULT_OPTIONS)
+        # Keep pooled connections to the LLM endpoint alive across calls;
+        # httpx adds HTTP/2 multiplexing when its h2 extra is installed,
+        # requests.Session covers keep-alive otherwise
+        if httpx is not None:
+            timeouts = httpx.Timeout(connect=5, read=self.timeout, write=60, pool=5)
+            limits = httpx.Limits(max_keepalive_connections=4)
+            try:
+                self._client = httpx.Client(http2=True, timeout=timeouts, limits=limits)
+            except ImportError:
+                self._client = httpx.Client(timeout=timeouts, limits=limits)
+            self._session = None
+        else:
+            self._client = None
+            self._session = requests.Session()
+
+    def close(self):
+        """Release the pooled HTTP connections"""
+        if self._client is not None:
+            self._client.close()
+        if self._session is not None:
+            self._session.close()
+
     def generate_documentation(self, code_context: Dict) -> str:
         """Generate documentation using local LLM"""
-        
+        return ''.join(self.stream_documentation(code_context))
+
+    def stream_documentation(self, code_context: Dict):
+        """Yield documentation text chunks as the local LLM produces them
+
+        Streaming lets the caller start writing output while the model is
+        still generating, instead of idling for the whole response.
+        Responses are cached on disk by (model, prompt) hash; set the
+        CODE_WIKI_NOCACHE environment variable to force regeneration.
+        """
         prompt = self._build_prompt(code_context)
-        
+
+        cache_path = None
+        if not os.environ.get('CODE_WIKI_NOCACHE'):
+            # Options affect the output, so runs with e.g. different
+            # temperature must not share cache entries
+            options = repr(sorted(self.options.items()))
+            key = hashlib.sha256(f"{self.model_name}\0{options}\0{prompt}".encode()).hexdigest()
+            cache_path = self.cache_dir / (key + '.txt')
+            if cache_path.exists():
+                yield cache_path.read_text(encoding='utf-8')
+                return
+
+        pieces = []
+        for chunk in self._stream_from_llm(prompt):
+            pieces.append(chunk)
+            yield chunk
+
+        if cache_path is not None:
+            self._store_cached_response(cache_path, ''.join(pieces))
+
+    def _stream_from_llm(self, prompt: str):
+        """Yield raw response chunks from the LLM endpoint"""
+        url = f"{self.base_url}/api/generate"
+        payload = _json_dumps({
+            "model": self.model_name,
+            "prompt": prompt,
+            "stream": True,
+            "options": self.options
+        })
+        headers = {"Content-Type": "application/json"}
+
         try:
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json={
-                    "model": self.model_name,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.1,
-                        "top_p": 0.9,
-                        "num_predict": 4000
-                    }
-                },
-                timeout=1
-            )
-            
-            if response.status_code == 200:
-                return response.json()["response"]
+            if self._client is not None:
+                with self._client.stream("POST", url, content=payload,
+                                         headers=headers) as response:
+                    if response.status_code != 200:
+                        raise Exception(f"Error generating documentation: {response.status_code}")
+                    yield from _parse_ndjson(response.iter_lines())
             else:
-                raise Exception("Error generating documentation: {response.status_code}")
-                
+                response = self._session.post(url, data=payload, headers=headers,
+                                              stream=True, timeout=self.timeout)
+                if response.status_code != 200:
+                    raise Exception(f"Error generating documentation: {response.status_code}")
+                yield from _parse_ndjson(response.iter_lines())
+
         except Exception as e:
             raise Exception("Error connecting to LLM")
-    
+
+    def generate_documentation_batch(self, code_contexts: List[Dict]) -> List[str]:
+        """Generate documentation for several code contexts concurrently"""
+        prompts = [self._build_prompt(ctx) for ctx in code_contexts]
+        return asyncio.run(self.agenerate(prompts))
+
+    async def agenerate(self, prompts: List[str]) -> List[str]:
+        """Generate responses for several prompts concurrently
+
+        One AsyncClient with keep-alive connections serves all prompts,
+        so network round-trips overlap while the endpoint works through
+        its queue.
+        """
+        if httpx is None:
+            raise Exception("httpx is required for batched generation")
+
+        async with httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout),
+            limits=httpx.Limits(max_keepalive_connections=8)
+        ) as client:
+            return await asyncio.gather(*(self._post_one(client, p) for p in prompts))
+
+    async def _post_one(self, client, prompt: str) -> str:
+        """Issue one generation request on the shared async client"""
+        response = await client.post(
+            f"{self.base_url}/api/generate",
+            content=_json_dumps({
+                "model": self.model_name,
+                "prompt": prompt,
+                "stream": False,
+                "options": self.options
+            }),
+            headers={"Content-Type": "application/json"}
+        )
+
+        if response.status_code != 200:
+            raise Exception(f"Error generating documentation: {response.status_code}")
+
+        return _json_loads(response.content)["response"]
+
+    def _store_cached_response(self, cache_path: Path, text: str):
+        """Persist a response atomically; cache failures are non-fatal"""
+        try:
+            self.cache_dir.mkdir(exist_ok=True)
+            tmp_path = cache_path.with_suffix('.tmp')
+            tmp_path.write_text(text, encoding='utf-8')
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            print(f"⚠️  Could not cache LLM response: {e}")
+
     def _build_prompt(self, code_context: Dict) -> str:
         """Build prompt for documentation generation"""
         
@@ -66,8 +223,8 @@ Format your response as clean Markdown with appropriate headers and code example
     
     def _create_code_summary(self, code_context: Dict) -> str:
         """Create a concise summary of the codebase for the prompt"""
-        
-        summary = f"""
+
+        parts = [f"""
 Project: {code_context.get('project_name', 'Unknown')}
 Total Files: {code_context.get('total_files', 0)}
 Languages: {', '.join(code_context.get('languages_used', []))}
@@ -75,16 +232,25 @@ Total Functions: {code_context.get('total_functions', 0)}
 Total Classes: {code_context.get('total_classes', 0)}
 
 Main Files:
-"""
-        
+"""]
+
         # Include first few files with their key functions
         for file_analysis in code_context['files'][:10]:  # Limit to first 10 files
-            summary += f"\n- {file_analysis['path']}"
+            parts.append(f"\n- {file_analysis['path']}")
             if file_analysis['functions']:
-                func_names = [f['name'] for f in file_analysis['functions'][:5]]
-                summary += f" (Functions: {', '.join(func_names)})"
-        
+                func_names = ', '.join(f['name'] for f in file_analysis['functions'][:5])
+                parts.append(f" (Functions: {func_names})")
+
         if len(code_context['files']) > 10:
-            summary += f"\n... and {len(code_context['files']) - 10} more files"
-        
-        return summary
\ No newline at end of file
+            parts.append(f"\n... and {len(code_context['files']) - 10} more files")
+
+        # Keep the prompt within the model's context budget
+        total = 0
+        for i, part in enumerate(parts):
+            total += len(part)
+            if total > _MAX_PROMPT_CHARS:
+                parts = parts[:i]
+                parts.append("\n... (summary truncated)")
+                break
+
+        return ''.join(parts)
\ No newline at end of file